@@ -1,9 +1,140 @@
 #Leitura e Inspeção Inicial dos Dados
-import pandas as pd 
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+import pandas as pd
 
 #Análise Exploratória de Dados (EDA) com Pandas Profiling
+import ydata_profiling
 from ydata_profiling import ProfileReport
 
-df = pd.read_csv('precos-glp-02_2025.csv', sep=";", encoding="utf-8", skipinitialspace=True, decimal=",", engine='python')
-profile = ProfileReport(df, title="Análise das vendas de GLP no Brasil em FEV-25")
-profile.to_file("output.html")
\ No newline at end of file
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scr"))
+from leitura import ler_csv, uso_memoria  # noqa: E402
+
+ARQUIVO_CSV = "precos-glp-02_2025.csv"
+ARQUIVO_SAIDA = "output.html"
+PASTA_CACHE = ".cache_eda"
+TITULO = "Análise das vendas de GLP no Brasil em FEV-25"
+
+
+def _cotas_por_grupo(tamanhos, limite_linhas):
+    """Divide ``limite_linhas`` entre os grupos pelo método dos maiores restos.
+
+    Se o limite permitir, cada grupo recebe ao menos uma linha e o restante
+    é dividido na proporção das demais linhas de cada grupo; a soma das
+    cotas é sempre igual a ``limite_linhas``.
+    """
+    minimo = 1 if limite_linhas >= len(tamanhos) else 0
+    vagas = limite_linhas - minimo * len(tamanhos)
+    proporcional = (tamanhos - minimo) * vagas / (tamanhos.sum() - minimo * len(tamanhos))
+    cotas = proporcional.astype(int)
+    sobra = vagas - cotas.sum()
+    maiores_restos = (proporcional - cotas).to_numpy().argsort(kind="stable")[::-1][:sobra]
+    cotas.iloc[maiores_restos] += 1
+    return cotas + minimo
+
+
+def amostrar_estratificado(df, limite_linhas, coluna, semente=42):
+    """Sorteia até ``limite_linhas`` linhas mantendo a proporção de cada grupo de ``coluna``."""
+    if len(df) <= limite_linhas:
+        return df
+    grupos = df.groupby(coluna, dropna=False, observed=True)
+    cotas = _cotas_por_grupo(grupos.size(), limite_linhas)
+    return pd.concat(
+        grupo.sample(n=cota, random_state=semente)
+        for (_, grupo), cota in zip(grupos, cotas)
+        if cota
+    )
+
+
+def chave_cache(caminho, config):
+    """Combina o hash do arquivo com a configuração do relatório."""
+    sha256 = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1024 * 1024), b""):
+            sha256.update(bloco)
+    sha256.update(json.dumps(config, sort_keys=True).encode("utf-8"))
+    return sha256.hexdigest()
+
+
+def gerar_perfil(caminho, saida, minimo=False, limite_linhas=None, estratificar_por="Estado - Sigla", usar_cache=True):
+    """Gera o relatório do ydata-profiling e retorna o tempo de cada etapa em segundos.
+
+    ``minimo`` desliga correlações, interações e os demais cálculos caros.
+    Com ``limite_linhas`` o relatório usa uma amostra estratificada pela
+    coluna ``estratificar_por``. Se o arquivo e a configuração não mudaram,
+    o relatório guardado em cache é reaproveitado.
+    """
+    config = {
+        "minimo": minimo,
+        "limite_linhas": limite_linhas,
+        "estratificar_por": estratificar_por,
+        "titulo": TITULO,
+        "leitura": "tipada",
+        "versao": ydata_profiling.__version__,
+    }
+    tempos = {}
+
+    inicio = time.perf_counter()
+    chave = chave_cache(caminho, config)
+    relatorio_cache = os.path.join(PASTA_CACHE, f"{chave}.html")
+    tempos["hash"] = time.perf_counter() - inicio
+
+    if usar_cache and os.path.exists(relatorio_cache):
+        shutil.copyfile(relatorio_cache, saida)
+        tempos["cache"] = time.perf_counter() - inicio - tempos["hash"]
+        return tempos
+
+    def medir(etapa, funcao):
+        inicio_etapa = time.perf_counter()
+        resultado = funcao()
+        tempos[etapa] = time.perf_counter() - inicio_etapa
+        return resultado
+
+    df = medir("leitura", lambda: ler_csv(caminho, tipado=True))
+    print(f"Memória do DataFrame: {uso_memoria(df)['bytes'].sum() / 1024 ** 2:.1f} MB")
+    if limite_linhas:
+        df = medir("amostragem", lambda: amostrar_estratificado(df, limite_linhas, estratificar_por))
+
+    profile = ProfileReport(df, title=TITULO, minimal=minimo)
+    medir("estatisticas", lambda: profile.description_set)
+    medir("estrutura", lambda: profile.report)
+    html = medir("html", lambda: profile.html)
+
+    def gravar():
+        with open(saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(html)
+        if usar_cache:
+            os.makedirs(PASTA_CACHE, exist_ok=True)
+            shutil.copyfile(saida, relatorio_cache)
+
+    medir("gravacao", gravar)
+    return tempos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera o relatório de análise exploratória do CSV.")
+    parser.add_argument("arquivo", nargs="?", default=ARQUIVO_CSV, help="Caminho do arquivo CSV.")
+    parser.add_argument("--saida", default=ARQUIVO_SAIDA, help="Arquivo HTML do relatório.")
+    parser.add_argument("--minimo", action="store_true", help="Desliga correlações e interações.")
+    parser.add_argument("--limite-linhas", type=int, help="Usa uma amostra estratificada com até este número de linhas.")
+    parser.add_argument("--estratificar-por", default="Estado - Sigla", help="Coluna usada na amostragem estratificada.")
+    parser.add_argument("--sem-cache", action="store_true", help="Gera o relatório mesmo que exista um em cache.")
+    args = parser.parse_args()
+
+    tempos = gerar_perfil(
+        args.arquivo,
+        args.saida,
+        minimo=args.minimo,
+        limite_linhas=args.limite_linhas,
+        estratificar_por=args.estratificar_por,
+        usar_cache=not args.sem_cache,
+    )
+    for etapa, segundos in tempos.items():
+        print(f"{etapa:<14}{segundos:8.2f}s")
+    print(f"{'total':<14}{sum(tempos.values()):8.2f}s")
@@ -0,0 +1,121 @@
+import logging
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from validador import ValidadorCSV  # Importa a classe de validação
+from validacao import limpar_textos_vazios
+
+PASTA_PARQUET = "dados_parquet"
+
+logger = logging.getLogger("pipeline")
+
+# Partições do dataset: mês da coleta (AAAA-MM) e sigla do estado
+ESQUEMA_PARTICOES = pa.schema([("ano_mes", pa.string()), ("estado_sigla", pa.string())])
+PARTICIONAMENTO = ds.partitioning(ESQUEMA_PARTICOES, flavor="hive")
+
+
+def _tipo_arrow(nome, campo):
+    """Traduz um campo do ValidadorCSV para o tipo da coluna no Parquet."""
+    if nome == "data_coleta":
+        return pa.date32()
+    if issubclass(campo.type_, float):
+        return pa.float64()
+    return pa.string()
+
+
+# Esquema fixo do dataset: sem ele, uma coluna toda vazia em um arquivo vira
+# tipo null e o dataset deixa de ler os arquivos em que ela tem valores
+ESQUEMA = pa.schema(
+    [(nome, _tipo_arrow(nome, campo)) for nome, campo in ValidadorCSV.__fields__.items()]
+    + [("ano_mes", pa.string())]
+)
+
+
+def _preparar(df):
+    """Converte os tipos e acrescenta a coluna do mês usada na partição."""
+    df = limpar_textos_vazios(df)
+    for nome, campo in ValidadorCSV.__fields__.items():
+        if issubclass(campo.type_, float):
+            df[nome] = df[nome].astype("float64")  # Mantém o tipo mesmo com a coluna toda vazia
+
+    datas = pd.to_datetime(df["data_coleta"], format="%d-%m-%Y", errors="coerce")
+    if datas.isna().any():
+        # O ValidadorCSV já rejeita datas inexistentes; isto só protege a gravação
+        logger.warning("%d linhas com data inválida descartadas do Parquet", datas.isna().sum())
+        df, datas = df[datas.notna()].copy(), datas[datas.notna()]
+    df["data_coleta"] = datas.dt.date
+    df["ano_mes"] = datas.dt.strftime("%Y-%m")
+    return df
+
+
+def _gravar(df, raiz, substituir_particoes):
+    ds.write_dataset(
+        pa.Table.from_pandas(df[ESQUEMA.names], schema=ESQUEMA, preserve_index=False),
+        raiz,
+        format="parquet",
+        partitioning=PARTICIONAMENTO,
+        basename_template=f"parte-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="delete_matching" if substituir_particoes else "overwrite_or_ignore",
+    )
+
+
+def gravar_parquet(df, raiz=PASTA_PARQUET, substituir_particoes=True):
+    """Grava os dados validados no dataset Parquet particionado.
+
+    ``df`` deve ter as colunas do ValidadorCSV já convertidas (como as
+    devolvidas por ``validar_por_coluna``). Com ``substituir_particoes`` as
+    partições (mês e estado) presentes em ``df`` são reescritas e as demais
+    ficam intactas, então regravar um mês não duplica dados. Sem ela, as
+    linhas são acrescentadas às partições existentes.
+    """
+    _gravar(_preparar(df), raiz, substituir_particoes)
+
+
+def gravador_em_lotes(raiz=PASTA_PARQUET):
+    """Retorna uma função que grava lotes sucessivos de um mesmo arquivo.
+
+    Na primeira vez que um lote traz uma partição, ela é substituída; nos
+    lotes seguintes as linhas dessa partição são acrescentadas. Assim,
+    reprocessar o arquivo inteiro não duplica dados.
+    """
+    gravadas = set()
+
+    def gravar_lote(df):
+        df = _preparar(df)
+        particoes = pd.Series(list(zip(df["ano_mes"], df["estado_sigla"])), index=df.index)
+        novas = ~particoes.isin(gravadas)
+        if novas.any():
+            _gravar(df[novas], raiz, substituir_particoes=True)
+        if not novas.all():
+            _gravar(df[~novas], raiz, substituir_particoes=False)
+        gravadas.update(particoes[novas])
+
+    return gravar_lote
+
+
+def ler_parquet(raiz=PASTA_PARQUET, colunas=None, estados=None, inicio=None, fim=None):
+    """Lê o dataset Parquet lendo apenas as colunas e partições pedidas.
+
+    ``inicio`` e ``fim`` são meses no formato ``AAAA-MM`` (inclusivos) e
+    ``estados`` é uma lista de siglas. Os filtros são aplicados sobre as
+    partições, então arquivos de outros meses e estados nem são abertos.
+    Exemplo: ``ler_parquet(colunas=["valor_venda"], estados=["SP"],
+    inicio="2025-01", fim="2025-03")``.
+    """
+    dataset = ds.dataset(raiz, schema=ESQUEMA, format="parquet", partitioning=PARTICIONAMENTO)
+
+    condicoes = []
+    if estados:
+        condicoes.append(ds.field("estado_sigla").isin(list(estados)))
+    if inicio:
+        condicoes.append(ds.field("ano_mes") >= inicio)
+    if fim:
+        condicoes.append(ds.field("ano_mes") <= fim)
+
+    filtro = None
+    for condicao in condicoes:
+        filtro = condicao if filtro is None else filtro & condicao
+
+    return dataset.to_table(columns=colunas, filter=filtro).to_pandas()
@@ -0,0 +1,234 @@
+"""Benchmark do pipeline com dados sintéticos no formato dos arquivos precos-glp.
+
+Gera arquivos com 10 mil, 1 milhão ou 10 milhões de linhas (com uma parte
+de CNPJs, CEPs e datas inválidos) e mede tempo e pico de memória de cada
+etapa: leitura do CSV, validação, perfil do ydata-profiling e carga. Os
+tempos e o pico de RSS vêm de uma passada sem tracemalloc; o pico de
+alocações do Python, de uma segunda passada com ele ligado. Exemplo::
+
+    python benchmark.py --linhas 10000 1000000 --proporcao-invalidos 0.01
+
+Sem ``--url`` a carga usa um SQLite temporário como substituto do banco;
+com ``--url`` ela usa o PostgreSQL informado (use um banco descartável).
+Cada passada carrega em uma tabela própria, vazia no início e apagada ao
+final, sem tocar no modelo estrela, então toda execução mede uma carga
+completa.
+"""
+import argparse
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+from instrumentacao import medir_etapa
+from leitura import ler_csv
+from validacao import preparar_dataframe, validar_por_coluna
+
+ARQUIVO_REFERENCIA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "precos-glp-02_2025.csv")
+LINHAS_POR_BLOCO = 1_000_000
+TIPOS_INVALIDOS = ("cnpj", "cep", "data")
+COLETAS_POR_REVENDA = 3  # Como no arquivo real, cerca de três coletas por revenda no mês
+DIAS_DO_MES = 28
+TABELAS_BENCHMARK = {"tempos": "precos_glp_benchmark_tempos", "memoria": "precos_glp_benchmark_memoria"}
+
+# Distribuição usada quando o arquivo de referência não está disponível
+REFERENCIA_PADRAO = {
+    "locais": [
+        ("SE", "SP", "SAO PAULO"), ("SE", "RJ", "RIO DE JANEIRO"), ("SE", "MG", "BELO HORIZONTE"),
+        ("S", "PR", "CURITIBA"), ("S", "RS", "PORTO ALEGRE"), ("NE", "BA", "SALVADOR"),
+        ("NE", "PE", "RECIFE"), ("CO", "DF", "BRASILIA"), ("CO", "GO", "GOIANIA"), ("N", "PA", "BELEM"),
+    ],
+    "bandeiras": ["BRANCA", "ULTRAGAZ", "LIQUIGÁS", "SUPERGASBRAS ENERGIA", "NACIONAL GÁS BUTANO", "COPA ENERGIA"],
+    "media_venda": 112.0,
+    "desvio_venda": 10.0,
+}
+
+
+def carregar_referencia(caminho=ARQUIVO_REFERENCIA):
+    """Extrai do arquivo real as distribuições usadas pelo gerador."""
+    if not os.path.exists(caminho):
+        return REFERENCIA_PADRAO
+
+    df = ler_csv(caminho, tipado=True)
+    return {
+        "locais": list(df[["Regiao - Sigla", "Estado - Sigla", "Municipio"]].astype(str).itertuples(index=False, name=None)),
+        "bandeiras": df["Bandeira"].astype(str).tolist(),
+        "media_venda": float(df["Valor de Venda"].mean()),
+        "desvio_venda": float(df["Valor de Venda"].std()),
+    }
+
+
+def _formatar_cnpj(numeros):
+    texto = pd.Series(numeros).astype(str).str.zfill(14)
+    return (" " + texto.str[:2] + "." + texto.str[2:5] + "." + texto.str[5:8]
+            + "/" + texto.str[8:12] + "-" + texto.str[12:])
+
+
+def gerar_dados_sinteticos(linhas, proporcao_invalidos=0.01, semente=42, referencia=None, ano=2025, mes=2,
+                           primeira_revenda=1):
+    """Gera um DataFrame com as colunas e o formato do CSV de preços de GLP.
+
+    Região, estado, município e bandeira são sorteados com as frequências da
+    ``referencia`` (por padrão, o arquivo real do repositório), assim como a
+    média e o desvio do valor de venda. Cada revenda (numeradas a partir de
+    ``primeira_revenda``) aparece no máximo uma vez por dia, então a chave
+    CNPJ, produto e data não se repete. Uma fração ``proporcao_invalidos``
+    das linhas recebe um CNPJ, CEP ou data inválido.
+    """
+    referencia = referencia or carregar_referencia()
+    rng = np.random.default_rng(semente)
+
+    locais = referencia["locais"]
+    sorteio_locais = rng.integers(0, len(locais), linhas)
+    regioes, estados, municipios = (np.array(coluna, dtype=object)[sorteio_locais] for coluna in zip(*locais))
+
+    # Sorteia pares (revenda, dia) distintos
+    quantidade_revendas = -(-linhas // COLETAS_POR_REVENDA)
+    pares = rng.choice(quantidade_revendas * DIAS_DO_MES, linhas, replace=False)
+    revendas = primeira_revenda + pares // DIAS_DO_MES
+    dias = 1 + pares % DIAS_DO_MES
+    cnpjs = _formatar_cnpj(10 ** 12 + revendas * 7_919)
+    ceps = pd.Series(1_000_000 + revendas * 37 % 98_000_000).astype(str).str.zfill(8)
+    valores = np.round(rng.normal(referencia["media_venda"], referencia["desvio_venda"], linhas).clip(min=60), 2)
+
+    df = pd.DataFrame({
+        "Regiao - Sigla": regioes,
+        "Estado - Sigla": estados,
+        "Municipio": municipios,
+        "Revenda": [f"REVENDA {numero} LTDA" for numero in revendas],
+        "CNPJ da Revenda": cnpjs,
+        "Nome da Rua": [f"RUA {numero}" for numero in rng.integers(1, 5000, linhas)],
+        "Numero Rua": rng.integers(1, 5000, linhas).astype(str),
+        "Complemento": None,
+        "Bairro": [f"BAIRRO {numero}" for numero in rng.integers(1, 2000, linhas)],
+        "Cep": ceps.str[:5] + "-" + ceps.str[5:],
+        "Produto": "GLP",
+        "Data da Coleta": pd.Series(dias).astype(str).str.zfill(2) + f"/{mes:02d}/{ano}",
+        "Valor de Venda": pd.Series(valores).map(lambda valor: f"{valor:g}".replace(".", ",")),
+        "Valor de Compra": None,
+        "Unidade de Medida": "R$ / 13 kg",
+        "Bandeira": rng.choice(np.array(referencia["bandeiras"], dtype=object), linhas),
+    })
+
+    # Injeta os valores inválidos
+    invalidas = np.flatnonzero(rng.random(linhas) < proporcao_invalidos)
+    tipos = rng.choice(TIPOS_INVALIDOS, len(invalidas))
+    for tipo, coluna, valor in (
+        ("cnpj", "CNPJ da Revenda", " 12.345.678/0001"),
+        ("cep", "Cep", "1234-56"),
+        ("data", "Data da Coleta", f"{mes:02d}/0000"),
+    ):
+        df.loc[df.index[invalidas[tipos == tipo]], coluna] = valor
+
+    return df
+
+
+def escrever_csv_sintetico(caminho, linhas, proporcao_invalidos=0.01, semente=42):
+    """Grava o CSV sintético em blocos, sem montar o arquivo inteiro em memória."""
+    referencia = carregar_referencia()
+    revendas_por_bloco = -(-LINHAS_POR_BLOCO // COLETAS_POR_REVENDA)
+    for numero, inicio in enumerate(range(0, linhas, LINHAS_POR_BLOCO)):
+        # Cada bloco usa revendas próprias, para a chave não se repetir entre blocos
+        bloco = gerar_dados_sinteticos(
+            min(LINHAS_POR_BLOCO, linhas - inicio), proporcao_invalidos, semente + numero, referencia,
+            primeira_revenda=1 + numero * revendas_por_bloco,
+        )
+        bloco.to_csv(caminho, sep=";", index=False, header=numero == 0, mode="w" if numero == 0 else "a")
+
+
+def _executar_etapas(caminho, url, perfil, tabela, **medicao):
+    """Executa as etapas do pipeline sobre ``caminho`` e retorna um registro por etapa."""
+    tempos = []
+
+    with medir_etapa("leitura", tempos, **medicao) as registro:
+        df = ler_csv(caminho)
+        registro["linhas"] = len(df)
+
+    with medir_etapa("validacao", tempos, **medicao) as registro:
+        registro["linhas"] = len(df)
+        erros, dados_validados = validar_por_coluna(preparar_dataframe(df))
+        registro["erros"] = len(erros)
+    del df
+
+    if perfil:
+        from ydata_profiling import ProfileReport
+
+        with medir_etapa("perfil", tempos, **medicao):
+            tipado = ler_csv(caminho, tipado=True)
+            ProfileReport(tipado, minimal=True, progress_bar=False).to_html()
+            del tipado
+
+    with medir_etapa("carga", tempos, **medicao) as registro:
+        registro["linhas"] = len(dados_validados)
+        if url:
+            from carga import carregar_no_postgresql, obter_engine
+
+            carregar_no_postgresql(dados_validados, obter_engine(url), tabela=tabela, modelo_estrela=False)
+        else:
+            with tempfile.TemporaryDirectory() as pasta:
+                engine = create_engine(f"sqlite:///{os.path.join(pasta, 'bench.db')}")
+                dados_validados.to_sql(tabela, engine, index=False, chunksize=100_000)
+                engine.dispose()
+
+    return tempos
+
+
+def _apagar_tabelas(url):
+    """Apaga as tabelas de preços do benchmark no PostgreSQL, se houver."""
+    if not url:
+        return
+    from carga import obter_engine
+
+    with obter_engine(url).begin() as conexao:
+        for tabela in TABELAS_BENCHMARK.values():
+            conexao.execute(text(f"DROP TABLE IF EXISTS {tabela}"))
+
+
+def executar_benchmark(caminho, url=None, perfil=True):
+    """Mede as etapas do pipeline sobre ``caminho`` e retorna um registro por etapa.
+
+    A primeira passada mede o tempo e o pico de RSS de cada etapa; a
+    segunda liga o tracemalloc para medir o pico de alocações do Python,
+    sem que o custo do rastreamento entre nos tempos.
+    """
+    try:
+        _apagar_tabelas(url)
+        tempos = _executar_etapas(caminho, url, perfil, TABELAS_BENCHMARK["tempos"], medir_rss=True)
+        memoria = _executar_etapas(caminho, url, perfil, TABELAS_BENCHMARK["memoria"], medir_memoria=True)
+    finally:
+        _apagar_tabelas(url)
+
+    for registro, medicao in zip(tempos, memoria):
+        registro["pico_memoria_mb"] = medicao["pico_memoria_mb"]
+    return tempos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline com dados sintéticos.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000], help="Tamanhos a testar (ex.: 10000 1000000 10000000).")
+    parser.add_argument("--proporcao-invalidos", type=float, default=0.01, help="Fração de linhas com CNPJ, CEP ou data inválidos.")
+    parser.add_argument("--semente", type=int, default=42, help="Semente do gerador de dados.")
+    parser.add_argument("--url", help="URL de um PostgreSQL descartável para a etapa de carga.")
+    parser.add_argument("--sem-perfil", action="store_true", help="Pula a etapa do ydata-profiling.")
+    parser.add_argument("--pasta", default="bench_dados", help="Pasta onde os CSVs sintéticos são gravados.")
+    parser.add_argument("--saida", help="Arquivo JSON onde gravar os resultados.")
+    args = parser.parse_args()
+
+    os.makedirs(args.pasta, exist_ok=True)
+    resultados = []
+    for linhas in args.linhas:
+        caminho = os.path.join(args.pasta, f"precos-glp-sintetico-{linhas}-{args.proporcao_invalidos}-{args.semente}.csv")
+        if not os.path.exists(caminho):
+            with medir_etapa("geracao", linhas=linhas):
+                escrever_csv_sintetico(caminho, linhas, args.proporcao_invalidos, args.semente)
+
+        for registro in executar_benchmark(caminho, args.url, perfil=not args.sem_perfil):
+            resultados.append({"tamanho": linhas, **registro})
+
+    tabela = pd.DataFrame(resultados)
+    print(tabela.to_string(index=False))
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultados, arquivo, ensure_ascii=False, indent=2)
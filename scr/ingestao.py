@@ -0,0 +1,130 @@
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from instrumentacao import medir_etapa
+from validacao import MAPEAMENTO_COLUNAS, validar_em_paralelo
+
+TAMANHO_LOTE = 50_000
+
+
+def ler_em_lotes(origem, tamanho_lote=TAMANHO_LOTE):
+    """Lê o CSV da ANP em lotes de ``tamanho_lote`` linhas, com as colunas como texto."""
+    return pd.read_csv(
+        origem,
+        sep=";",
+        dtype=str,
+        encoding="utf-8",
+        chunksize=tamanho_lote,
+    )
+
+
+def ingerir_csv(origem, carregar=None, arquivo_erros=None, tamanho_lote=TAMANHO_LOTE, processos=1, finalizar=None):
+    """Lê, valida e carrega o CSV lote a lote, sem mantê-lo inteiro em memória.
+
+    Cada lote é validado com as regras do ValidadorCSV. As linhas válidas são
+    entregues a ``carregar`` (uma função que recebe um DataFrame) e as
+    mensagens de erro são gravadas em ``arquivo_erros`` à medida que surgem.
+    A numeração das linhas nos erros é a mesma da validação do arquivo inteiro.
+    ``processos`` divide a validação de cada lote entre vários processos,
+    criados uma única vez para o arquivo inteiro (``None`` usa todos os
+    núcleos).
+    ``finalizar`` é chamada uma única vez ao fim do arquivo com as datas de
+    coleta de todas as linhas carregadas, por exemplo para recalcular os
+    agregados desses períodos sem refazê-los a cada lote.
+
+    Retorna a quantidade de linhas válidas e de linhas com erro.
+    """
+    total_validas = 0
+    total_erros = 0
+    datas_carregadas = set()
+
+    if processos is None:
+        processos = os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=processos) if processos > 1 else None
+
+    saida_erros = open(arquivo_erros, "w", encoding="utf-8") if arquivo_erros else None
+    try:
+        for numero, lote in enumerate(ler_em_lotes(origem, tamanho_lote), start=1):
+            lote.rename(columns=MAPEAMENTO_COLUNAS, inplace=True)
+            with medir_etapa("validacao", lote=numero, linhas=len(lote)) as registro:
+                erros, dados_validados = validar_em_paralelo(lote, processos=processos, executor=executor)
+                registro["erros"] = len(erros)
+
+            if saida_erros is not None:
+                for erro in erros:
+                    saida_erros.write(erro.replace("\n", " | ") + "\n")
+                saida_erros.flush()
+
+            if carregar is not None and not dados_validados.empty:
+                with medir_etapa("carga", lote=numero, linhas=len(dados_validados)):
+                    carregar(dados_validados)
+                datas_carregadas.update(dados_validados["data_coleta"].unique())
+
+            total_validas += len(dados_validados)
+            total_erros += len(erros)
+    finally:
+        if saida_erros is not None:
+            saida_erros.close()
+        if executor is not None:
+            executor.shutdown()
+
+    if finalizar is not None and datas_carregadas:
+        with medir_etapa("finalizacao", datas=len(datas_carregadas)):
+            finalizar(datas_carregadas)
+
+    return total_validas, total_erros
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Valida um CSV de preços da ANP em lotes.")
+    parser.add_argument("arquivo", help="Caminho do arquivo CSV.")
+    parser.add_argument("--erros", default="erros_validacao.txt", help="Arquivo onde os erros serão gravados.")
+    parser.add_argument("--tamanho-lote", type=int, default=TAMANHO_LOTE, help="Quantidade de linhas por lote.")
+    parser.add_argument("--banco", action="store_true", help="Carrega as linhas válidas no PostgreSQL.")
+    parser.add_argument("--parquet", help="Pasta do dataset Parquet onde gravar as linhas válidas.")
+    parser.add_argument("--processos", type=int, default=1, help="Processos usados na validação (0 usa todos os núcleos).")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+
+    carregadores = []
+    if args.banco:
+        from carga import (
+            arquivo_ja_carregado,
+            atualizar_agregados_periodos,
+            carregar_no_postgresql,
+            hash_arquivo,
+            registrar_arquivo,
+        )
+
+        arquivo_hash = hash_arquivo(args.arquivo)
+        if arquivo_ja_carregado(arquivo_hash):
+            print(f"{args.arquivo} já foi carregado no banco de dados.")
+            if not args.parquet:
+                raise SystemExit(0)
+            args.banco = False
+        else:
+            # Os agregados são recalculados uma única vez, ao fim do arquivo
+            carregadores.append(lambda lote: carregar_no_postgresql(lote, atualizar_agregados=False))
+    if args.parquet:
+        from armazenamento_parquet import gravador_em_lotes
+
+        carregadores.append(gravador_em_lotes(args.parquet))
+
+    def carregar(lote):
+        for carregador in carregadores:
+            carregador(lote)
+
+    validas, com_erro = ingerir_csv(
+        args.arquivo,
+        carregar=carregar,
+        arquivo_erros=args.erros,
+        tamanho_lote=args.tamanho_lote,
+        processos=args.processos or None,
+        finalizar=atualizar_agregados_periodos if args.banco else None,
+    )
+    if args.banco:
+        registrar_arquivo(arquivo_hash, os.path.basename(args.arquivo), validas)
+    print(f"{validas} linhas válidas, {com_erro} linhas com erro (detalhes em {args.erros}).")
@@ -0,0 +1,83 @@
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # O módulo resource não existe no Windows
+    resource = None
+
+logger = logging.getLogger("pipeline")
+
+
+def _reiniciar_pico_rss():
+    """Zera o pico de RSS do processo; só é possível no Linux."""
+    try:
+        with open("/proc/self/clear_refs", "w") as arquivo:
+            arquivo.write("5")
+    except OSError:
+        pass
+
+
+def pico_rss_mb():
+    """Retorna o pico de memória residente (RSS) do processo, em MB.
+
+    Ao contrário do tracemalloc, inclui a memória alocada fora do Python,
+    como os buffers do Arrow. Onde o pico não pode ser zerado (fora do
+    Linux) o valor é o pico desde o início do processo.
+    """
+    try:
+        with open("/proc/self/status") as arquivo:
+            for linha in arquivo:
+                if linha.startswith("VmHWM:"):
+                    return round(int(linha.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    return round(pico / (1024 ** 2 if sys.platform == "darwin" else 1024), 1)
+
+
+@contextmanager
+def medir_etapa(nome, tempos=None, medir_memoria=False, medir_rss=False, **contexto):
+    """Mede o tempo de uma etapa do pipeline e registra o resultado em log JSON.
+
+    O dicionário entregue pelo ``with`` pode receber campos extras (por
+    exemplo, a quantidade de linhas). Ao final ele ganha ``segundos`` e,
+    com ``medir_memoria``, ``pico_memoria_mb`` (pico de alocações do Python
+    durante a etapa, medido com tracemalloc). Com ``medir_rss`` ganha
+    ``pico_rss_mb``, o pico de memória residente do processo durante a
+    etapa. O tracemalloc deixa o código mais lento, então não o use ao
+    medir tempos; o RSS não tem custo. Se ``tempos`` for uma lista, o
+    registro também é acrescentado a ela.
+    """
+    registro = {"etapa": nome, **contexto}
+    iniciou_tracemalloc = medir_memoria and not tracemalloc.is_tracing()
+    if iniciou_tracemalloc:
+        tracemalloc.start()
+    elif medir_memoria:
+        tracemalloc.reset_peak()
+    if medir_rss:
+        _reiniciar_pico_rss()
+
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro["segundos"] = round(time.perf_counter() - inicio, 4)
+        if medir_memoria:
+            _, pico = tracemalloc.get_traced_memory()
+            registro["pico_memoria_mb"] = round(pico / 1024 ** 2, 1)
+            if iniciou_tracemalloc:
+                tracemalloc.stop()
+        if medir_rss:
+            registro["pico_rss_mb"] = pico_rss_mb()
+
+        logger.info(json.dumps(registro, ensure_ascii=False, default=str))
+        if tempos is not None:
+            tempos.append(registro)
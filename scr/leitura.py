@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+from validador import ValidadorCSV  # Importa a classe de validação
+from validacao import MAPEAMENTO_COLUNAS
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow é opcional: sem ele usamos o parser C do pandas
+    pa = None
+
+# Campos com poucos valores distintos, guardados como categorias
+CAMPOS_CATEGORICOS = ("regiao_sigla", "estado_sigla", "municipio", "produto", "unidade_medida", "bandeira")
+FORMATO_DATA = "%d/%m/%Y"
+
+# Textos lidos como célula vazia, os mesmos que o pd.read_csv usa por padrão
+VALORES_NULOS = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+
+def _colunas_por_campo():
+    """Relaciona cada campo do ValidadorCSV com o nome da coluna no CSV."""
+    return {campo: coluna for coluna, campo in MAPEAMENTO_COLUNAS.items() if campo in ValidadorCSV.__fields__}
+
+
+def _campos_numericos():
+    return [nome for nome, campo in ValidadorCSV.__fields__.items() if issubclass(campo.type_, float)]
+
+
+def _ler_pyarrow(origem, categoricas, texto_arrow):
+    """Lê o CSV com o parser do pyarrow, com todas as colunas como texto."""
+    tipos = {coluna: pa.dictionary(pa.int32(), pa.string()) if coluna in categoricas else pa.string()
+             for coluna in MAPEAMENTO_COLUNAS}
+    tabela = pa_csv.read_csv(
+        origem,
+        parse_options=pa_csv.ParseOptions(delimiter=";"),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=tipos, null_values=VALORES_NULOS, strings_can_be_null=True
+        ),
+    )
+    if texto_arrow:
+        # Guarda o texto em buffers do Arrow em vez de um objeto Python por célula
+        return tabela.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+
+    # O Arrow devolve None nas células vazias; o pandas (e a validação) esperam NaN
+    df = tabela.to_pandas()
+    texto = [coluna for coluna in df.columns if coluna not in categoricas]
+    df[texto] = df[texto].where(df[texto].notna(), np.nan)
+    return df
+
+
+def _ler_pandas(origem, categoricas):
+    """Lê o CSV com o parser C do pandas, com todas as colunas como texto."""
+    tipos = {coluna: "category" if coluna in categoricas else str for coluna in MAPEAMENTO_COLUNAS}
+    return pd.read_csv(origem, sep=";", dtype=tipos, encoding="utf-8", engine="c")
+
+
+def ler_csv(origem, tipado=False, precisao_valores="float64"):
+    """Lê o CSV de preços da ANP com tipos derivados do ValidadorCSV.
+
+    As colunas de poucos valores distintos viram categorias. Com
+    ``tipado=False`` o restante fica como texto (objetos ``str``, com
+    células vazias como NaN), exatamente como no arquivo, para que a
+    validação veja os valores originais. Com ``tipado=True`` os valores de
+    venda e compra viram números (``precisao_valores``), a data da coleta
+    vira data e o texto fica em colunas do Arrow; valores que não puderem
+    ser convertidos ficam nulos.
+    """
+    colunas = _colunas_por_campo()
+    categoricas = {colunas[campo] for campo in CAMPOS_CATEGORICOS}
+
+    if hasattr(origem, "seek"):
+        origem.seek(0)
+    df = _ler_pyarrow(origem, categoricas, tipado) if pa is not None else _ler_pandas(origem, categoricas)
+
+    if tipado:
+        for campo in _campos_numericos():
+            coluna = colunas[campo]
+            df[coluna] = pd.to_numeric(
+                df[coluna].str.replace(",", ".", regex=False), errors="coerce"
+            ).astype(precisao_valores)
+
+        coluna = colunas["data_coleta"]
+        df[coluna] = pd.to_datetime(df[coluna], format=FORMATO_DATA, errors="coerce")
+
+    return df
+
+
+def uso_memoria(df):
+    """Retorna o tipo e a memória ocupada (em bytes) por coluna, da maior para a menor."""
+    relatorio = pd.DataFrame({
+        "tipo": df.dtypes.astype(str),
+        "bytes": df.memory_usage(deep=True, index=False),
+    })
+    return relatorio.sort_values("bytes", ascending=False)
@@ -0,0 +1,147 @@
+"""Modelo estrela e tabelas agregadas consumidos pelo Power BI.
+
+As tabelas são mantidas pela carga: a cada execução só as revendas, locais,
+fatos e períodos presentes nas linhas carregadas são atualizados.
+"""
+
+DDL_MODELO_ESTRELA = [
+    """CREATE TABLE IF NOT EXISTS dim_revenda (
+    cnpj_revenda VARCHAR(14) PRIMARY KEY,
+    revenda TEXT NOT NULL,
+    bandeira TEXT NOT NULL,
+    ultima_coleta DATE NOT NULL
+)""",
+    """CREATE TABLE IF NOT EXISTS dim_local (
+    local_id SERIAL PRIMARY KEY,
+    regiao_sigla VARCHAR(2) NOT NULL,
+    estado_sigla VARCHAR(2) NOT NULL DEFAULT '',
+    municipio TEXT NOT NULL,
+    cep VARCHAR(8) NOT NULL,
+    UNIQUE (regiao_sigla, estado_sigla, municipio, cep)
+)""",
+    """CREATE TABLE IF NOT EXISTS fato_preco (
+    cnpj_revenda VARCHAR(14) NOT NULL REFERENCES dim_revenda (cnpj_revenda),
+    produto TEXT NOT NULL,
+    data_coleta DATE NOT NULL,
+    local_id INTEGER NOT NULL REFERENCES dim_local (local_id),
+    bandeira TEXT NOT NULL,
+    unidade_medida TEXT NOT NULL,
+    valor_venda NUMERIC(10, 3) NOT NULL,
+    valor_compra NUMERIC(10, 3),
+    PRIMARY KEY (cnpj_revenda, produto, data_coleta)
+)""",
+    "CREATE INDEX IF NOT EXISTS fato_preco_data_coleta_idx ON fato_preco (data_coleta)",
+]
+
+# Tabelas agregadas: nome -> (coluna de período, expressão do período, duração do período, colunas de agrupamento)
+AGREGADOS = {
+    "agg_preco_diario_municipio": ("data_coleta", "f.data_coleta", "1 day", ("l.estado_sigla", "l.municipio")),
+    "agg_preco_mensal_municipio": ("mes", "date_trunc('month', f.data_coleta)::date", "1 month", ("l.estado_sigla", "l.municipio")),
+    "agg_preco_diario_bandeira": ("data_coleta", "f.data_coleta", "1 day", ("f.bandeira",)),
+    "agg_preco_mensal_bandeira": ("mes", "date_trunc('month', f.data_coleta)::date", "1 month", ("f.bandeira",)),
+}
+
+
+def _ddl_agregado(nome, periodo, agrupamento):
+    colunas = [periodo] + [coluna.split(".")[1] for coluna in agrupamento] + ["produto"]
+    definicoes = [f"    {periodo} DATE NOT NULL"]
+    definicoes += [f"    {coluna} TEXT NOT NULL" for coluna in colunas[1:]]
+    definicoes += [
+        "    valor_min NUMERIC(10, 3) NOT NULL",
+        "    valor_medio NUMERIC(12, 4) NOT NULL",
+        "    valor_max NUMERIC(10, 3) NOT NULL",
+        "    qtd_coletas INTEGER NOT NULL",
+        f"    PRIMARY KEY ({', '.join(colunas)})",
+    ]
+    return f"CREATE TABLE IF NOT EXISTS {nome} (\n" + ",\n".join(definicoes) + "\n)"
+
+
+def criar_modelo_estrela(cursor):
+    """Cria as dimensões, a tabela fato e as tabelas agregadas, se não existirem."""
+    for ddl in DDL_MODELO_ESTRELA:
+        cursor.execute(ddl)
+    for nome, (periodo, _, _, agrupamento) in AGREGADOS.items():
+        cursor.execute(_ddl_agregado(nome, periodo, agrupamento))
+
+
+def _atualizar_dimensoes(cursor, origem):
+    # Nome e bandeira da revenda seguem a coleta mais recente
+    cursor.execute(
+        "INSERT INTO dim_revenda (cnpj_revenda, revenda, bandeira, ultima_coleta) "
+        "SELECT DISTINCT ON (cnpj_revenda) cnpj_revenda, revenda, bandeira, data_coleta "
+        f"FROM {origem} ORDER BY cnpj_revenda, data_coleta DESC, chave_linha "
+        "ON CONFLICT (cnpj_revenda) DO UPDATE SET "
+        "revenda = EXCLUDED.revenda, bandeira = EXCLUDED.bandeira, ultima_coleta = EXCLUDED.ultima_coleta "
+        "WHERE EXCLUDED.ultima_coleta >= dim_revenda.ultima_coleta"
+    )
+    cursor.execute(
+        "INSERT INTO dim_local (regiao_sigla, estado_sigla, municipio, cep) "
+        "SELECT DISTINCT regiao_sigla, COALESCE(estado_sigla, ''), municipio, cep "
+        f"FROM {origem} ON CONFLICT DO NOTHING"
+    )
+
+
+def _atualizar_fatos(cursor, origem):
+    cursor.execute(
+        "INSERT INTO fato_preco (cnpj_revenda, produto, data_coleta, local_id, bandeira, "
+        "unidade_medida, valor_venda, valor_compra) "
+        "SELECT DISTINCT ON (o.cnpj_revenda, o.produto, o.data_coleta) "
+        "o.cnpj_revenda, o.produto, o.data_coleta, l.local_id, o.bandeira, "
+        "o.unidade_medida, o.valor_venda, o.valor_compra "
+        f"FROM {origem} o JOIN dim_local l ON l.regiao_sigla = o.regiao_sigla "
+        "AND l.estado_sigla = COALESCE(o.estado_sigla, '') AND l.municipio = o.municipio AND l.cep = o.cep "
+        "ORDER BY o.cnpj_revenda, o.produto, o.data_coleta, o.chave_linha "
+        "ON CONFLICT (cnpj_revenda, produto, data_coleta) DO UPDATE SET "
+        "local_id = EXCLUDED.local_id, bandeira = EXCLUDED.bandeira, "
+        "unidade_medida = EXCLUDED.unidade_medida, valor_venda = EXCLUDED.valor_venda, "
+        "valor_compra = EXCLUDED.valor_compra"
+    )
+
+
+def _atualizar_agregados(cursor, origem):
+    """Recalcula os agregados apenas dos dias e meses presentes em ``origem``.
+
+    ``origem`` só precisa ter a coluna ``data_coleta``. Cada período
+    afetado vira um intervalo de datas, para que a leitura da fato use o
+    índice de ``data_coleta``.
+    """
+    for nome, (periodo, expressao, duracao, agrupamento) in AGREGADOS.items():
+        afetados = f"SELECT DISTINCT {expressao.replace('f.', '')} AS inicio FROM {origem}"
+        colunas = ", ".join(list(agrupamento) + ["f.produto"])
+        cursor.execute(f"DELETE FROM {nome} WHERE {periodo} IN (SELECT inicio FROM ({afetados}) p)")
+        cursor.execute(
+            f"INSERT INTO {nome} "
+            f"SELECT {expressao}, {colunas}, MIN(f.valor_venda), AVG(f.valor_venda), "
+            "MAX(f.valor_venda), COUNT(*) "
+            f"FROM ({afetados}) p "
+            "JOIN fato_preco f ON f.data_coleta >= p.inicio "
+            f"AND f.data_coleta < (p.inicio + interval '{duracao}')::date "
+            "JOIN dim_local l ON l.local_id = f.local_id "
+            f"GROUP BY {expressao}, {colunas}"
+        )
+
+
+def recalcular_agregados(cursor, origem):
+    """Recalcula os agregados dos dias e meses das datas de ``origem``.
+
+    Permite adiar o recálculo quando um arquivo é carregado em vários lotes:
+    cada lote atualiza só dimensões e fatos, e os agregados são refeitos uma
+    única vez no final.
+    """
+    criar_modelo_estrela(cursor)
+    _atualizar_agregados(cursor, origem)
+
+
+def atualizar_modelo_estrela(cursor, origem, agregados=True):
+    """Leva as linhas da tabela ``origem`` para o modelo estrela e atualiza os agregados.
+
+    ``origem`` deve ter as colunas da tabela de preços (inclusive
+    ``chave_linha``, que desempata linhas repetidas); na carga é a tabela
+    de staging, então só os períodos carregados são recalculados. Sem
+    ``agregados`` apenas dimensões e fatos são atualizados.
+    """
+    criar_modelo_estrela(cursor)
+    _atualizar_dimensoes(cursor, origem)
+    _atualizar_fatos(cursor, origem)
+    if agregados:
+        _atualizar_agregados(cursor, origem)
@@ -0,0 +1,189 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import pandas as pd
+from validador import ValidadorCSV  # Importa a classe de validação
+
+# Mapeia as colunas do CSV para as chaves do modelo Pydantic
+MAPEAMENTO_COLUNAS = {
+    "Regiao - Sigla": "regiao_sigla",
+    "Estado - Sigla": "estado_sigla",
+    "Municipio": "municipio",
+    "Revenda": "revenda",
+    "CNPJ da Revenda": "cnpj_revenda",
+    "Nome da Rua": "nome_rua",
+    "Numero Rua": "numero_rua",
+    "Complemento": "complemento",
+    "Bairro": "bairro",
+    "Cep": "cep",
+    "Produto": "produto",
+    "Data da Coleta": "data_coleta",
+    "Valor de Venda": "valor_venda",
+    "Valor de Compra": "valor_compra",
+    "Unidade de Medida": "unidade_medida",
+    "Bandeira": "bandeira"
+}
+
+
+def preparar_dataframe(df):
+    """Renomeia as colunas para as chaves do modelo e remove linhas vazias."""
+    # Renomeia as colunas do DataFrame para corresponder às chaves do modelo
+    df.rename(columns=MAPEAMENTO_COLUNAS, inplace=True)
+
+    # Remove linhas completamente vazias
+    df.dropna(how="all", inplace=True)
+    return df
+
+
+def validar_por_linha(df):
+    """Valida cada linha com o Pydantic e retorna os erros e os dados validados."""
+    erros = []
+    dados_validados = []
+
+    for index, row in df.iterrows():
+        try:
+            # Verifica se a linha está vazia ou nula
+            if row.isnull().all():
+                continue  # Ignora linhas completamente vazias
+
+            # Converte os dados para dicionário e valida
+            usuario_validado = ValidadorCSV.parse_obj(row.to_dict())
+            dados_validados.append(usuario_validado)
+        except Exception as e:
+            erros.append(f"Linha {index + 1}: {str(e)}")
+
+    return erros, dados_validados
+
+
+def _validar_coluna(campo, coluna):
+    """Valida os valores distintos de uma coluna com o campo do modelo.
+
+    Retorna os valores convertidos e uma máscara das linhas válidas.
+    """
+    codigos, distintos = pd.factorize(coluna, use_na_sentinel=False)
+
+    # Campos texto sem regras extras: strings já são válidas como estão
+    sem_regras = (
+        campo.outer_type_ is str
+        and not campo.pre_validators
+        and not campo.post_validators
+    )
+
+    convertidos = []
+    validos = []
+    for valor in distintos:
+        if sem_regras and isinstance(valor, str):
+            convertidos.append(valor)
+            validos.append(True)
+            continue
+        try:
+            convertido, erro = campo.validate(valor, {}, loc=campo.alias, cls=ValidadorCSV)
+        except Exception as e:
+            # Ex.: AttributeError de um validador ao receber NaN; o parse_obj
+            # da linha reprovada gera a mesma mensagem da validação por linha
+            convertido, erro = None, e
+        convertidos.append(None if erro else convertido)
+        validos.append(erro is None)
+
+    convertidos = pd.Series(convertidos, dtype=object).take(codigos)
+    validos = pd.Series(validos, dtype=bool).take(codigos)
+    convertidos.index = coluna.index
+    validos.index = coluna.index
+    return convertidos, validos
+
+
+def validar_por_coluna(df):
+    """Valida o DataFrame coluna a coluna com as regras do ValidadorCSV.
+
+    Cada valor distinto de uma coluna passa uma única vez pelo campo
+    correspondente do modelo, e o resultado é espalhado para as linhas.
+    As linhas reprovadas são validadas de novo com ``parse_obj``, de modo
+    que as mensagens de erro sejam as mesmas da validação por linha.
+    """
+    df = df.dropna(how="all")
+    linhas_validas = pd.Series(True, index=df.index)
+    colunas = {}
+
+    for nome, campo in ValidadorCSV.__fields__.items():
+        if campo.alias in df.columns:
+            colunas[nome], validos = _validar_coluna(campo, df[campo.alias])
+            linhas_validas &= validos
+        elif campo.required:
+            linhas_validas[:] = False
+        else:
+            colunas[nome] = pd.Series(campo.get_default(), index=df.index, dtype=object)
+
+    erros, _ = validar_por_linha(df[~linhas_validas])
+    dados_validados = pd.DataFrame(colunas, index=df.index)[linhas_validas].infer_objects()
+    # Campos numéricos sempre em float64, mesmo vazios, para que os
+    # resultados de partições diferentes tenham os mesmos tipos
+    numericos = {nome: "float64" for nome, campo in ValidadorCSV.__fields__.items() if issubclass(campo.type_, float)}
+    return erros, dados_validados.astype(numericos)
+
+
+def limpar_textos_vazios(df):
+    """Troca por nulo o texto "nan" que o Pydantic gera a partir de células vazias.
+
+    Vale só para os campos texto opcionais, onde a célula vazia é aceita.
+    """
+    df = df.copy()
+    for nome, campo in ValidadorCSV.__fields__.items():
+        if nome in df.columns and not campo.required and issubclass(campo.type_, str):
+            df[nome] = df[nome].replace("nan", None)
+    return df
+
+
+MODOS_VALIDACAO = {
+    "linha": validar_por_linha,
+    "colunar": validar_por_coluna,
+}
+
+
+def validar_em_paralelo(df, validar=validar_por_coluna, processos=None, executor=None):
+    """Divide o DataFrame em partições e valida cada uma em um processo.
+
+    As partições são fatias contíguas do DataFrame e os resultados são
+    juntados na ordem original, então os erros saem na mesma ordem qualquer
+    que seja o número de processos. Com ``processos`` igual a 1 (ou com
+    poucas linhas) a validação é feita no próprio processo. Um ``executor``
+    já criado (por exemplo, um ProcessPoolExecutor reaproveitado entre os
+    lotes de um arquivo) é usado no lugar de um novo, e não é encerrado.
+    """
+    if processos is None:
+        processos = os.cpu_count() or 1
+    processos = max(1, min(processos, len(df)))
+
+    if processos == 1:
+        return validar(df)
+
+    tamanho = -(-len(df) // processos)  # Divisão arredondada para cima
+    particoes = [df.iloc[inicio:inicio + tamanho] for inicio in range(0, len(df), tamanho)]
+
+    contexto = ProcessPoolExecutor(max_workers=processos) if executor is None else nullcontext(executor)
+    with contexto as executor:
+        resultados = list(executor.map(validar, particoes))
+
+    erros = [erro for erros_particao, _ in resultados for erro in erros_particao]
+    validados = [dados for _, dados in resultados]
+    if isinstance(validados[0], pd.DataFrame):
+        dados_validados = pd.concat(validados)
+    else:
+        dados_validados = [dado for dados in validados for dado in dados]
+    return erros, dados_validados
+
+
+def validar_csv(df, modo="colunar", processos=1):
+    """Valida as linhas do CSV e retorna os erros encontrados.
+
+    ``modo`` pode ser ``"colunar"`` (padrão) ou ``"linha"``, que valida
+    cada linha individualmente com o Pydantic. ``processos`` define quantos
+    processos dividem a validação (``None`` usa todos os núcleos).
+    """
+    preparar_dataframe(df)
+
+    if modo not in MODOS_VALIDACAO:
+        raise ValueError(f"Modo de validação desconhecido: {modo}")
+
+    erros, _ = validar_em_paralelo(df, MODOS_VALIDACAO[modo], processos)
+    return erros
@@ -1,4 +1,9 @@
-from pydantic import BaseModel, Field, validator
+try:
+    # O pydantic 2 (requirements.txt) mantém a API usada aqui em pydantic.v1
+    from pydantic.v1 import BaseModel, Field, validator
+except ImportError:
+    from pydantic import BaseModel, Field, validator
+from datetime import datetime
 from typing import Optional
 import re
 
@@ -41,6 +46,15 @@ class ValidadorCSV(BaseModel):
         """Converte a data para o formato dd-mm-aaaa."""
         return data.replace("/", "-")
 
+    @validator("data_coleta")
+    def validar_data_existente(cls, data: str) -> str:
+        """Rejeita datas no formato certo que não existem no calendário, como 31-02-2025."""
+        try:
+            datetime.strptime(data, "%d-%m-%Y")
+        except ValueError:
+            raise ValueError("Data da coleta não existe no calendário.")
+        return data
+
     @validator("valor_venda", pre=True)
     def tratar_valor_venda(cls, valor: str | float) -> float:
         """Converte o valor_venda para float, substituindo vírgula por ponto."""
@@ -0,0 +1,9 @@
+import os
+import sys
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Os módulos do pipeline ficam em scr/ e se importam pelo nome, sem pacote;
+# o main.py fica na raiz
+sys.path.insert(0, os.path.join(RAIZ, "scr"))
+sys.path.insert(0, RAIZ)
@@ -0,0 +1,26 @@
+from armazenamento_parquet import gravador_em_lotes, gravar_parquet, ler_parquet
+from validacao import preparar_dataframe, validar_por_coluna
+
+from test_validacao import ARQUIVOS, ler
+
+
+def test_gravador_descarta_data_invalida(tmp_path):
+    _, dados_validados = validar_por_coluna(preparar_dataframe(ler(ARQUIVOS[0]).head(5)))
+    dados_validados.loc[dados_validados.index[0], "data_coleta"] = "31-02-2025"
+
+    gravador_em_lotes(tmp_path / "parquet")(dados_validados)
+
+    assert len(ler_parquet(tmp_path / "parquet")) == 4
+
+
+def test_coluna_vazia_em_uma_particao_nao_impede_a_leitura(tmp_path):
+    _, dados_validados = validar_por_coluna(preparar_dataframe(ler(ARQUIVOS[0]).head(4)))
+    sem_complemento = dados_validados.iloc[:2].assign(estado_sigla="AC", complemento=None, valor_compra=None)
+    com_complemento = dados_validados.iloc[2:].assign(estado_sigla="SP", complemento="LOJA 1", valor_compra=100.0)
+
+    gravar_parquet(sem_complemento, tmp_path / "parquet")
+    gravar_parquet(com_complemento, tmp_path / "parquet")
+
+    lido = ler_parquet(tmp_path / "parquet", colunas=["complemento", "valor_compra"])
+    assert sorted(lido["complemento"].dropna()) == ["LOJA 1", "LOJA 1"]
+    assert len(ler_parquet(tmp_path / "parquet", estados=["SP"])) == 2
@@ -0,0 +1,117 @@
+import os
+
+import pandas as pd
+
+import ingestao
+from carga import CHAVE_NATURAL, _preparar_para_copy, calcular_chave_linha, hash_arquivo
+from ingestao import ingerir_csv
+from validacao import preparar_dataframe, validar_por_coluna
+
+from test_validacao import ARQUIVOS, RAIZ, ler
+
+
+def test_data_inexistente_vai_para_o_arquivo_de_erros(tmp_path):
+    df = ler(ARQUIVOS[0]).head(20)
+    df.loc[df.index[10], "Data da Coleta"] = "31/02/2025"
+    origem = tmp_path / "precos.csv"
+    df.to_csv(origem, sep=";", index=False)
+    arquivo_erros = tmp_path / "erros.txt"
+    carregados = []
+
+    validas, com_erro = ingerir_csv(
+        origem, carregar=lambda lote: carregados.append(_preparar_para_copy(lote)),
+        arquivo_erros=arquivo_erros, tamanho_lote=7,
+    )
+
+    assert (validas, com_erro) == (19, 1)
+    assert sum(len(lote) for lote in carregados) == 19
+    assert arquivo_erros.read_text(encoding="utf-8").startswith("Linha 11:")
+
+
+def test_preparar_para_copy_descarta_data_invalida():
+    _, dados_validados = validar_por_coluna(preparar_dataframe(ler(ARQUIVOS[0]).head(5)))
+    dados_validados.loc[dados_validados.index[0], "data_coleta"] = "31-02-2025"
+
+    preparado = _preparar_para_copy(dados_validados)
+
+    assert len(preparado) == 4
+    assert preparado["data_coleta"].str.match(r"^\d{4}-\d{2}-\d{2}$").all()
+
+
+def test_preparar_para_copy_mantem_a_ultima_linha_da_chave_repetida():
+    _, dados_validados = validar_por_coluna(preparar_dataframe(ler(ARQUIVOS[0]).head(3)))
+    repetida = dados_validados.iloc[[0]].assign(valor_venda=dados_validados["valor_venda"].iloc[0] + 1)
+    dados_validados = pd.concat([dados_validados, repetida], ignore_index=True)
+
+    preparado = _preparar_para_copy(dados_validados)
+
+    assert len(preparado) == 3
+    assert preparado["valor_venda"].iloc[-1] == repetida["valor_venda"].iloc[0]
+    assert not preparado.duplicated(list(CHAVE_NATURAL)).any()
+
+
+def test_ingestao_em_paralelo_cria_os_processos_uma_vez(tmp_path, monkeypatch):
+    df = ler(ARQUIVOS[0]).head(40)
+    df.loc[df.index[25], "Cep"] = "1234-56"
+    origem = tmp_path / "precos.csv"
+    df.to_csv(origem, sep=";", index=False)
+
+    criados = []
+
+    class Executor(ingestao.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            criados.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(ingestao, "ProcessPoolExecutor", Executor)
+    erros_serial, erros_paralelo = tmp_path / "serial.txt", tmp_path / "paralelo.txt"
+
+    serial = ingerir_csv(origem, arquivo_erros=erros_serial, tamanho_lote=10)
+    paralelo = ingerir_csv(origem, arquivo_erros=erros_paralelo, tamanho_lote=10, processos=2)
+
+    assert paralelo == serial == (39, 1)
+    assert erros_paralelo.read_text(encoding="utf-8") == erros_serial.read_text(encoding="utf-8")
+    assert len(criados) == 1
+
+
+def test_chave_linha_nao_depende_do_formato_do_valor():
+    linha = {"cnpj_revenda": "04976718001221", "data_coleta": "2025-02-03", "produto": "GLP"}
+    valores = [115.0, 115, "115", "115.000"]
+    df = pd.DataFrame([{**linha, "valor_venda": valor} for valor in valores])
+
+    assert calcular_chave_linha(df).nunique() == 1
+    assert calcular_chave_linha(df.astype({"valor_venda": "float64"})).equals(calcular_chave_linha(df))
+
+
+def _chaves(df):
+    _, dados_validados = validar_por_coluna(preparar_dataframe(df))
+    preparado = _preparar_para_copy(dados_validados)
+    return preparado.set_index(list(CHAVE_NATURAL))["chave_linha"]
+
+
+def test_arquivo_editado_muda_apenas_a_chave_das_linhas_alteradas():
+    original = ler(ARQUIVOS[0])
+    editado = ler(ARQUIVOS[1])
+    # Além das edições do arquivo, muda o preço de três linhas e só a
+    # formatação do preço de outras três
+    alteradas = editado.index[[200, 300, 400]]
+    editado.loc[alteradas, "Valor de Venda"] = "999"
+    reformatadas = editado.index[[500, 600, 700]]
+    editado.loc[reformatadas, "Valor de Venda"] = editado.loc[reformatadas, "Valor de Venda"] + ",00"
+
+    cnpjs_alterados = set(editado.loc[alteradas, "CNPJ da Revenda"].str.replace(r"\D", "", regex=True))
+
+    chaves_originais, chaves_editadas = _chaves(original), _chaves(editado)
+
+    novas = chaves_editadas[~chaves_editadas.isin(chaves_originais)]
+    assert len(novas) == 3
+    assert set(novas.index.get_level_values("cnpj_revenda")) == cnpjs_alterados
+
+
+def test_hash_arquivo_igual_para_caminho_e_bytes():
+    caminho, editado = (os.path.join(RAIZ, nome) for nome in ARQUIVOS)
+    with open(caminho, "rb") as arquivo:
+        conteudo = arquivo.read()
+
+    assert hash_arquivo(caminho) == hash_arquivo(conteudo)
+    assert hash_arquivo(caminho) != hash_arquivo(editado)
@@ -0,0 +1,31 @@
+import io
+
+import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
+
+from leitura import VALORES_NULOS, ler_csv
+from validacao import preparar_dataframe, validar_por_coluna
+
+from test_validacao import ARQUIVOS, ler
+
+
+def test_valores_nulos_iguais_aos_do_pandas():
+    assert set(VALORES_NULOS) == set(STR_NA_VALUES)
+
+
+def test_leitura_sem_tipos_gera_os_mesmos_erros_do_read_csv():
+    df = ler(ARQUIVOS[0]).head(6)
+    df.loc[df.index[0], "CNPJ da Revenda"] = None
+    df.loc[df.index[1], "Valor de Venda"] = None
+    df.loc[df.index[2], "Revenda"] = "None"
+    df.loc[df.index[3], "Cep"] = "NA"
+    conteudo = df.to_csv(sep=";", index=False).encode("utf-8")
+
+    esperado = pd.read_csv(io.BytesIO(conteudo), sep=";", dtype=str, encoding="utf-8")
+    lido = ler_csv(io.BytesIO(conteudo))
+
+    assert lido.isna().equals(esperado.isna())
+    erros_esperados, _ = validar_por_coluna(preparar_dataframe(esperado))
+    erros, _ = validar_por_coluna(preparar_dataframe(lido))
+    assert erros == erros_esperados
+    assert [erro.split(":")[0] for erro in erros] == ["Linha 1", "Linha 2", "Linha 4"]
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from leitura import ler_csv
+from main import amostrar_estratificado
+
+from test_validacao import ARQUIVOS, RAIZ
+
+
+@pytest.fixture(scope="module")
+def precos():
+    return ler_csv(os.path.join(RAIZ, ARQUIVOS[0]), tipado=True)
+
+
+@pytest.mark.parametrize("limite", [5, 37, 500, 5000])
+def test_amostra_estratificada_respeita_o_limite(precos, limite):
+    amostra = amostrar_estratificado(precos, limite, "Estado - Sigla")
+
+    assert len(amostra) == limite
+    assert not amostra.index.duplicated().any()
+
+
+def test_amostra_estratificada_tem_todos_os_estados(precos):
+    estados = precos["Estado - Sigla"].nunique()
+    amostra = amostrar_estratificado(precos, estados + 10, "Estado - Sigla")
+
+    assert amostra["Estado - Sigla"].nunique() == estados
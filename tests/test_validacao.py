@@ -0,0 +1,56 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from validacao import preparar_dataframe, validar_csv, validar_em_paralelo
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+ARQUIVOS = ["precos-glp-02_2025.csv", "precos-glp-02_2025_edit.csv"]
+
+
+def ler(nome):
+    return pd.read_csv(os.path.join(RAIZ, nome), sep=";", dtype=str, encoding="utf-8")
+
+
+def comparar_modos(df):
+    erros_linha = validar_csv(df.copy(), modo="linha")
+    erros_coluna = validar_csv(df.copy(), modo="colunar")
+    assert erros_coluna == erros_linha
+    return erros_linha
+
+
+@pytest.mark.parametrize("nome", ARQUIVOS)
+def test_modos_iguais_nos_arquivos_do_repositorio(nome):
+    comparar_modos(ler(nome))
+
+
+def test_modos_iguais_com_linhas_invalidas():
+    df = ler(ARQUIVOS[0]).head(7).reset_index(drop=True)
+    df.loc[0, "CNPJ da Revenda"] = np.nan
+    df.loc[1, "Valor de Venda"] = "abc"
+    df.loc[2, "Estado - Sigla"] = "sp"
+    df.loc[3, :] = np.nan
+    df.loc[4, "Valor de Venda"] = np.nan
+    df.loc[5, "Data da Coleta"] = "31/02/2025"
+    df.loc[6, "Data da Coleta"] = np.nan
+
+    erros = comparar_modos(df)
+
+    assert [erro.split(":")[0] for erro in erros] == [
+        "Linha 1", "Linha 2", "Linha 3", "Linha 5", "Linha 6", "Linha 7",
+    ]
+    assert "calendário" in erros[-2]
+
+
+@pytest.mark.filterwarnings("error::FutureWarning")
+def test_validacao_em_paralelo_mantem_os_tipos_das_particoes():
+    df = preparar_dataframe(ler(ARQUIVOS[0]).head(40))
+    df.loc[df.index[30:], "valor_compra"] = "100"  # Só a última partição tem valor de compra
+    df.loc[df.index[:10], "cnpj_revenda"] = "x"  # E a primeira não tem linha válida
+
+    erros, dados_validados = validar_em_paralelo(df, processos=4)
+
+    assert len(erros) == 10
+    assert dados_validados["valor_compra"].dtype == "float64"
+    assert dados_validados["valor_compra"].notna().sum() == 10